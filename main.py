@@ -11,14 +11,34 @@ Deploy to cloud: mcp-agent deploy mcp-server-tester
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Final, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and unavailable on Windows
+    uvloop = None
+
 from mcp_agent.app import MCPApp
 from mcp_agent.core.context import Context as AppContext
-from mcp_agent.workflows.llm.augmented_llm_openai import OpenAIAugmentedLLM
+from mcp_agent.mcp.gen_client import connect, disconnect
 
 # Create the MCPApp
 app = MCPApp(
@@ -27,6 +47,313 @@ app = MCPApp(
 )
 
 
+# ===== HELPERS =====
+
+def _dump_json(obj: Any) -> bytes:
+    """
+    Serialize obj as indented JSON, using orjson when it is installed.
+
+    Values JSON can't represent (e.g. a stray exception object in a result)
+    are written as their str() instead of failing the whole report.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2)
+    # Keep non-ASCII symbols as raw UTF-8, as orjson does, so report bytes don't
+    # depend on which encoder is installed
+    return json.dumps(obj, indent=2, default=str, ensure_ascii=False).encode()
+
+
+# Start time of the current test run, shared by every result it produces
+_RUN_TIMESTAMP: ContextVar[Optional[str]] = ContextVar("run_timestamp", default=None)
+
+
+def _now_iso() -> str:
+    """Timestamp for a result: the current run's start time, or now outside a run."""
+    return _RUN_TIMESTAMP.get() or datetime.now().isoformat()
+
+
+def _sample(text: str, limit: int = 150) -> str:
+    """Truncate text to limit characters, marking the cut with "..."."""
+    return f"{text[:limit]}..." if len(text) > limit else text
+
+
+def _first_text(result) -> str:
+    """Return the text of a tool result's first content block, or "" if it has none."""
+    content = result.content
+    return content[0].text if content else ""
+
+
+def _server_configs(registry) -> dict:
+    """
+    Return the registry's server name -> settings map.
+
+    ServerRegistry keeps it under .registry in the pinned mcp-agent release;
+    server_configs is checked first for registries that expose it.
+    """
+    return getattr(registry, "server_configs", None) or getattr(registry, "registry", None) or {}
+
+
+@dataclass(slots=True)
+class ServerTestResult:
+    """Outcome of a single server test, as reported in the JSON results."""
+
+    server: str
+    status: str
+    transport: str
+    auth_required: bool
+    details: Optional[str] = None
+    test_description: Optional[str] = None
+    error: Optional[str] = None
+    error_detail: Optional[str] = None
+    error_type: Optional[str] = None
+    data_sample: Optional[str] = None
+    timestamp: str = field(default_factory=_now_iso)
+    # Test-specific measurements such as bytes_received or total_lines
+    metrics: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """Convert to a plain dict, leaving out fields that were not set."""
+        result = {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in ("timestamp", "metrics") and getattr(self, f.name) is not None
+        }
+        result.update(self.metrics)
+        result["timestamp"] = self.timestamp
+        return result
+
+
+def _error_result(server: str, transport: str, auth_required: bool, e: Exception, ts: str) -> dict:
+    """Build the result for a test that raised before producing data."""
+    return ServerTestResult(
+        server=server,
+        status="error",
+        transport=transport,
+        auth_required=auth_required,
+        error=str(e),
+        error_type=type(e).__name__,
+        timestamp=ts
+    ).to_dict()
+
+
+# ===== TOOL RESULT CACHE =====
+
+# Maps a call key to (monotonic time stored, CallToolResult)
+_TOOL_CACHE: dict[str, tuple[float, Any]] = {}
+_CACHE_STATS = {"hits": 0, "misses": 0}
+
+# Reusing results means a run can report success without contacting the server,
+# so the per-test TTLs only apply when this is switched on
+_CACHE_RESULTS = os.environ.get("MCP_TEST_CACHE_RESULTS", "0") == "1"
+
+
+def _cache_key(server_name: str, tool_name: str, arguments: dict) -> str:
+    """Hash a tool call into a stable cache key."""
+    if orjson is not None:
+        canonical = orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS)
+    else:
+        # Match orjson's compact, non-ASCII-escaping output so keys don't depend on it
+        canonical = json.dumps(
+            arguments, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        ).encode()
+    return hashlib.blake2b(f"{server_name}\0{tool_name}\0".encode() + canonical).hexdigest()
+
+
+async def call_tool(registry, server_name: str, tool_name: str, arguments: dict):
+    """
+    Call a tool, over the pooled session when the server is in the connection
+    pool and through the server registry otherwise.
+    """
+    if server_name in _LAST_USED:
+        _LAST_USED[server_name] = time.monotonic()
+        session = await connect(server_name, registry)
+        return await session.call_tool(tool_name, arguments)
+
+    return await registry.call_tool(
+        server_name=server_name,
+        tool_name=tool_name,
+        arguments=arguments
+    )
+
+
+async def cached_call_tool(
+    registry,
+    server_name: str,
+    tool_name: str,
+    arguments: dict,
+    ttl: float = 300
+) -> tuple[Any, bool]:
+    """
+    Call a tool, reusing a recent result for an identical call.
+
+    Args:
+        registry: Server registry used to perform the actual call
+        server_name: Name of the MCP server
+        tool_name: Tool to call on that server
+        arguments: Arguments for the tool
+        ttl: Seconds a cached result stays valid (0 disables caching)
+
+    Returns: (result, from_cache), so callers can report that the server
+    was not contacted. Error results and results whose _meta carries
+    cache_hint "no-cache" are never stored.
+    """
+    if ttl <= 0:
+        return await call_tool(registry, server_name, tool_name, arguments), False
+
+    key = _cache_key(server_name, tool_name, arguments)
+    cached = _TOOL_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        _CACHE_STATS["hits"] += 1
+        return cached[1], True
+
+    _CACHE_STATS["misses"] += 1
+    result = await call_tool(registry, server_name, tool_name, arguments)
+
+    meta = getattr(result, "meta", None) or {}
+    if not getattr(result, "isError", False) and meta.get("cache_hint") != "no-cache":
+        _TOOL_CACHE[key] = (time.monotonic(), result)
+
+    return result, False
+
+
+# ===== TOOL LIST CACHE =====
+
+# Maps a server name to (monotonic time stored, list of Tool)
+_TOOLS_CACHE: dict[str, tuple[float, list]] = {}
+
+
+async def cached_list_tools(registry, server_name: str, ttl: float = 60) -> list:
+    """List the tools a server offers, reusing the answer for ttl seconds."""
+    cached = _TOOLS_CACHE.get(server_name)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    session = await connect(server_name, registry)
+    tools = (await session.list_tools()).tools
+    _TOOLS_CACHE[server_name] = (time.monotonic(), tools)
+    return tools
+
+
+def invalidate_tools_cache(server_name: Optional[str] = None) -> None:
+    """Drop the cached tool list for one server, or for all servers if none is given."""
+    if server_name is None:
+        _TOOLS_CACHE.clear()
+    else:
+        _TOOLS_CACHE.pop(server_name, None)
+
+
+# ===== PERSISTENT SERVER CONNECTIONS =====
+
+KNOWN_SERVERS = (
+    "fetch", "filesystem", "playwright", "sequential-thinking",
+    "airweave-search", "circleci", "perplexity", "maps-grounding-lite", "hubspot", "supabase",
+    "atlassian", "figma", "github", "linear", "notion",
+)
+
+# Maps a pooled server name to the monotonic time it was last used
+_LAST_USED: dict[str, float] = {}
+# Deadline for warming one server, so a hung server can't hold up the whole run
+_CONNECT_TIMEOUT_S = 10.0
+
+
+# Runs currently holding the pool open
+_POOL_USERS = 0
+_POOL_LOCK: Optional[asyncio.Lock] = None
+
+
+@asynccontextmanager
+async def _connection_pool(
+    app_ctx: AppContext,
+    server_names: tuple[str, ...] = KNOWN_SERVERS,
+    connect_timeout: float = _CONNECT_TIMEOUT_S
+):
+    """
+    Open persistent connections to all configured servers up front and keep them
+    open for the lifetime of the block, so tests don't pay a spawn/handshake per call.
+
+    The pool is reference counted: overlapping runs (e.g. concurrent
+    run_all_server_tests calls) share the connections, and only the last run
+    to leave disconnects them. Only servers the pool connected are disconnected.
+    """
+    global _POOL_USERS, _POOL_LOCK
+    logger = app_ctx.app.logger
+    registry = app_ctx.server_registry
+    configs = _server_configs(registry)
+    if _POOL_LOCK is None:
+        _POOL_LOCK = asyncio.Lock()
+
+    async with _POOL_LOCK:
+        # Servers already pooled by an earlier, still-running user are reused as is
+        to_warm = [
+            name for name in server_names
+            if name in configs and name not in _LAST_USED
+        ]
+
+        # Launch servers under the same limits as the tests, so stdio servers
+        # don't all start (and compete for CPU) at once
+        semaphore, transport_semaphores = _concurrency_limits(_MAX_CONCURRENCY)
+
+        async def warm(server_name: str):
+            transport = getattr(configs[server_name], "transport", None) or "stdio"
+            async with transport_semaphores.get(transport) or nullcontext(), semaphore:
+                return await asyncio.wait_for(connect(server_name, registry), timeout=connect_timeout)
+
+        warmed = await asyncio.gather(*map(warm, to_warm), return_exceptions=True)
+
+        now = time.monotonic()
+        failed = []
+        for server_name, outcome in zip(to_warm, warmed):
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.warning(f"Could not pre-connect to {server_name}: timed out after {connect_timeout:g}s")
+                failed.append(server_name)
+            elif isinstance(outcome, Exception):
+                logger.warning(f"Could not pre-connect to {server_name}: {outcome}")
+                failed.append(server_name)
+            else:
+                _LAST_USED[server_name] = now
+
+        # A cancelled connect may already have launched the server; shut it down
+        # rather than leave it running outside the pool
+        await asyncio.gather(
+            *(disconnect(name, registry) for name in failed),
+            return_exceptions=True
+        )
+
+        _POOL_USERS += 1
+
+    try:
+        yield
+    finally:
+        async with _POOL_LOCK:
+            _POOL_USERS -= 1
+            if _POOL_USERS == 0:
+                pooled = list(_LAST_USED)
+                _LAST_USED.clear()
+                await asyncio.gather(
+                    *(disconnect(name, registry) for name in pooled),
+                    return_exceptions=True
+                )
+
+
+# ===== ERROR CLASSIFICATION =====
+
+_ERROR_RE = re.compile(
+    r"(?P<not_configured>not found|not configured|no such server)"
+    r"|(?P<auth_error>unauthorized|authentication|forbidden|401|403)"
+    r"|(?P<connection_error>timeout|connection|refused)"
+    r"|(?P<oauth_required>oauth|token)",
+    re.IGNORECASE
+)
+
+# Error status -> friendly message, in priority order
+_ERROR_CATEGORIES = {
+    "not_configured": "Server or credentials not configured",
+    "auth_error": "Authentication failed - check credentials/OAuth flow",
+    "connection_error": "Connection failed - server may be unreachable",
+    "oauth_required": "OAuth authentication required - run oauth flow first",
+}
+
+
 # ===== INDIVIDUAL SERVER TEST TOOLS =====
 
 @app.tool()
@@ -37,17 +364,20 @@ async def test_fetch_server(app_ctx: Optional[AppContext] = None) -> dict:
     Returns test result with status and details.
     """
     logger = app_ctx.app.logger
+    ts = _now_iso()
     logger.info("Testing fetch server - Fetching apple.com homepage...")
 
     try:
         # Fetch Apple's homepage
-        result = await app_ctx.server_registry.call_tool(
+        result, from_cache = await cached_call_tool(
+            app_ctx.server_registry,
             server_name="fetch",
             tool_name="fetch",
-            arguments={"url": "https://www.apple.com"}
+            arguments={"url": "https://www.apple.com"},
+            ttl=60 if _CACHE_RESULTS else 0
         )
 
-        content = result.content[0].text if result.content else ""
+        content = _first_text(result)
 
         if not content or len(content) < 100:
             raise ValueError("No valid content received from apple.com")
@@ -56,28 +386,23 @@ async def test_fetch_server(app_ctx: Optional[AppContext] = None) -> dict:
         if "apple" not in content.lower():
             raise ValueError("Did not receive Apple homepage content")
 
-        return {
-            "server": "fetch",
-            "status": "success",
-            "transport": "stdio",
-            "auth_required": False,
-            "details": f"✓ Fetched apple.com homepage ({len(content)} bytes)",
-            "test_description": "Fetch apple.com and extract content",
-            "bytes_received": len(content),
-            "data_sample": content[:200] + "...",
-            "timestamp": datetime.now().isoformat()
-        }
+        return ServerTestResult(
+            server="fetch",
+            status="success",
+            transport="stdio",
+            auth_required=False,
+            details=f"✓ Fetched apple.com homepage ({len(content)} bytes)",
+            test_description="Fetch apple.com and extract content",
+            data_sample=_sample(content, 200),
+            timestamp=ts,
+            metrics={
+                "bytes_received": len(content),
+                "cached": from_cache,
+            }
+        ).to_dict()
     except Exception as e:
         logger.error(f"Fetch server test failed: {e}")
-        return {
-            "server": "fetch",
-            "status": "error",
-            "transport": "stdio",
-            "auth_required": False,
-            "error": str(e),
-            "error_type": type(e).__name__,
-            "timestamp": datetime.now().isoformat()
-        }
+        return _error_result("fetch", "stdio", False, e, ts)
 
 
 @app.tool()
@@ -88,47 +413,49 @@ async def test_filesystem_server(app_ctx: Optional[AppContext] = None) -> dict:
     Returns test result with status and details.
     """
     logger = app_ctx.app.logger
+    ts = _now_iso()
     logger.info("Testing filesystem server - Reading README.md first 3 lines...")
 
     try:
         # Read the README file
-        readme_result = await app_ctx.server_registry.call_tool(
+        readme_result, from_cache = await cached_call_tool(
+            app_ctx.server_registry,
             server_name="filesystem",
             tool_name="read_file",
-            arguments={"path": "README.md"}
+            arguments={"path": "README.md"},
+            ttl=300 if _CACHE_RESULTS else 0
         )
 
-        readme_content = readme_result.content[0].text if readme_result.content else ""
+        readme_content = _first_text(readme_result)
 
         if not readme_content:
             raise ValueError("Failed to read README.md")
 
-        # Get first 3 lines
-        lines = readme_content.split('\n')
-        first_3_lines = '\n'.join(lines[:3])
-
-        return {
-            "server": "filesystem",
-            "status": "success",
-            "transport": "stdio",
-            "auth_required": False,
-            "details": f"✓ Read README.md - First 3 lines extracted",
-            "test_description": "Read README.md and get first 3 lines",
-            "total_lines": len(lines),
-            "data_sample": first_3_lines,
-            "timestamp": datetime.now().isoformat()
-        }
+        # Get first 3 lines without splitting the whole file
+        first_3_lines = '\n'.join(readme_content.split('\n', 3)[:3])
+        total_lines = readme_content.count('\n') + 1
+
+        return ServerTestResult(
+            server="filesystem",
+            status="success",
+            transport="stdio",
+            auth_required=False,
+            details=f"✓ Read README.md - First 3 lines extracted",
+            test_description="Read README.md and get first 3 lines",
+            data_sample=first_3_lines,
+            timestamp=ts,
+            metrics={
+                "total_lines": total_lines,
+                "cached": from_cache,
+            }
+        ).to_dict()
     except Exception as e:
         logger.error(f"Filesystem server test failed: {e}")
-        return {
-            "server": "filesystem",
-            "status": "error",
-            "transport": "stdio",
-            "auth_required": False,
-            "error": str(e),
-            "error_type": type(e).__name__,
-            "timestamp": datetime.now().isoformat()
-        }
+        return _error_result("filesystem", "stdio", False, e, ts)
+
+
+# Case-insensitive match without lowercasing a copy of the whole snapshot
+_EXAMPLE_DOMAIN_RE = re.compile(r"example domain", re.IGNORECASE)
 
 
 @app.tool()
@@ -139,52 +466,60 @@ async def test_playwright_server(app_ctx: Optional[AppContext] = None) -> dict:
     Returns test result with status and details.
     """
     logger = app_ctx.app.logger
+    ts = _now_iso()
     logger.info("Testing playwright server - Loading example.com and getting title...")
 
     try:
         # Navigate to example.com
-        nav_result = await app_ctx.server_registry.call_tool(
+        nav_result = await call_tool(
+            app_ctx.server_registry,
             server_name="playwright",
             tool_name="playwright_navigate",
             arguments={"url": "https://example.com"}
         )
 
         # Capture the page snapshot
-        snapshot_result = await app_ctx.server_registry.call_tool(
+        snapshot_result = await call_tool(
+            app_ctx.server_registry,
             server_name="playwright",
             tool_name="playwright_snapshot",
             arguments={}
         )
 
-        snapshot_content = snapshot_result.content[0].text if snapshot_result.content else ""
+        snapshot_content = _first_text(snapshot_result)
 
         # Validate we got example.com
-        if "example domain" not in snapshot_content.lower():
+        if not _EXAMPLE_DOMAIN_RE.search(snapshot_content):
             raise ValueError("Failed to load example.com")
 
-        return {
-            "server": "playwright",
-            "status": "success",
-            "transport": "stdio",
-            "auth_required": False,
-            "details": f"✓ Navigated to example.com and captured page",
-            "test_description": "Go to example.com and get page title",
-            "page_loaded": "example.com",
-            "page_content_length": len(snapshot_content),
-            "data_sample": snapshot_content[:200] + "...",
-            "timestamp": datetime.now().isoformat()
-        }
+        return ServerTestResult(
+            server="playwright",
+            status="success",
+            transport="stdio",
+            auth_required=False,
+            details=f"✓ Navigated to example.com and captured page",
+            test_description="Go to example.com and get page title",
+            data_sample=_sample(snapshot_content, 200),
+            timestamp=ts,
+            metrics={
+                "page_loaded": "example.com",
+                "page_content_length": len(snapshot_content),
+            }
+        ).to_dict()
     except Exception as e:
         logger.error(f"Playwright server test failed: {e}")
-        return {
-            "server": "playwright",
-            "status": "error",
-            "transport": "stdio",
-            "auth_required": False,
-            "error": str(e),
-            "error_type": type(e).__name__,
-            "timestamp": datetime.now().isoformat()
-        }
+        return _error_result("playwright", "stdio", False, e, ts)
+
+
+_THOUGHT_ARGS = (
+    # Step 1: State the problem
+    {"thought": "What is 15% of 200?", "thoughtType": "observation"},
+    # Step 2: Provide the answer
+    {"thought": "15% of 200 = 0.15 × 200 = 30", "thoughtType": "conclusion"},
+)
+
+# Create both thoughts concurrently (only safe if the server doesn't rely on call order)
+_SEQUENTIAL_THINKING_PARALLEL = os.environ.get("MCP_SEQUENTIAL_THINKING_PARALLEL", "0") == "1"
 
 
 @app.tool()
@@ -195,57 +530,93 @@ async def test_sequential_thinking_server(app_ctx: Optional[AppContext] = None)
     Returns test result with status and details.
     """
     logger = app_ctx.app.logger
+    ts = _now_iso()
     logger.info("Testing sequential-thinking server - Creating problem and solution thoughts...")
 
     try:
-        # Step 1: State the problem
-        thought1 = await app_ctx.server_registry.call_tool(
-            server_name="sequential-thinking",
-            tool_name="create_thought",
-            arguments={
-                "thought": "What is 15% of 200?",
-                "thoughtType": "observation"
-            }
-        )
-
-        # Step 2: Provide the answer
-        thought2 = await app_ctx.server_registry.call_tool(
-            server_name="sequential-thinking",
-            tool_name="create_thought",
-            arguments={
-                "thought": "15% of 200 = 0.15 × 200 = 30",
-                "thoughtType": "conclusion"
-            }
-        )
+        def create_thought(args: dict):
+            return call_tool(
+                app_ctx.server_registry,
+                server_name="sequential-thinking",
+                tool_name="create_thought",
+                arguments=args
+            )
+
+        # Problem then answer; the server tracks thought order, so only
+        # overlap the calls when explicitly allowed
+        if _SEQUENTIAL_THINKING_PARALLEL:
+            thought1, thought2 = await asyncio.gather(*map(create_thought, _THOUGHT_ARGS))
+        else:
+            thought1 = await create_thought(_THOUGHT_ARGS[0])
+            thought2 = await create_thought(_THOUGHT_ARGS[1])
 
-        content1 = thought1.content[0].text if thought1.content else ""
-        content2 = thought2.content[0].text if thought2.content else ""
+        content1 = _first_text(thought1)
+        content2 = _first_text(thought2)
 
         if not content1 or not content2:
             raise ValueError("Failed to create thoughts")
 
-        return {
-            "server": "sequential-thinking",
-            "status": "success",
-            "transport": "stdio",
-            "auth_required": False,
-            "details": "✓ Created 2 sequential thoughts (problem → solution)",
-            "test_description": "Create problem and solution thoughts",
-            "thoughts_created": 2,
-            "data_sample": f"{content1[:50]}... → {content2[:50]}...",
-            "timestamp": datetime.now().isoformat()
-        }
+        return ServerTestResult(
+            server="sequential-thinking",
+            status="success",
+            transport="stdio",
+            auth_required=False,
+            details="✓ Created 2 sequential thoughts (problem → solution)",
+            test_description="Create problem and solution thoughts",
+            data_sample=f"{content1[:50]}... → {content2[:50]}...",
+            timestamp=ts,
+            metrics={
+                "thoughts_created": 2,
+            }
+        ).to_dict()
     except Exception as e:
         logger.error(f"Sequential thinking server test failed: {e}")
-        return {
-            "server": "sequential-thinking",
-            "status": "error",
-            "transport": "stdio",
-            "auth_required": False,
-            "error": str(e),
-            "error_type": type(e).__name__,
-            "timestamp": datetime.now().isoformat()
-        }
+        return _error_result("sequential-thinking", "stdio", False, e, ts)
+
+
+# No-auth servers and their test tools, dispatched as one table by the orchestrator
+NO_AUTH_TESTS: Final = (
+    ("fetch", "stdio", test_fetch_server),
+    ("filesystem", "stdio", test_filesystem_server),
+    ("playwright", "stdio", test_playwright_server),
+    ("sequential-thinking", "stdio", test_sequential_thinking_server),
+)
+
+# Deadline for each remote call made by an auth server test
+_TEST_TIMEOUT_S = 10.0
+
+# Descriptive test messages for auth-required servers
+_TEST_DESCRIPTIONS: Final = MappingProxyType({
+    "github": "Search Python AI repos with 1000+ stars",
+    "linear": "Search for bug issues",
+    "notion": "Search workspace for 'meeting notes'",
+    "perplexity": "Ask about latest LLM developments",
+    "supabase": "List your Supabase projects",
+    "hubspot": "Search contacts in CRM",
+    "circleci": "Get pipelines for React repo",
+    "figma": "Get design file data",
+    "atlassian": "Search JIRA for in-progress issues",
+    "airweave": "Search knowledge base for AI trends",
+    "maps-grounding-lite": "Find coffee shops in San Francisco"
+})
+
+
+def _describe_test(server_name: str, test_tool: str, test_description: str = "") -> str:
+    """Pick the human-readable description for an auth server test."""
+    return test_description or _TEST_DESCRIPTIONS.get(server_name, f"Call {test_tool}")
+
+
+def _not_configured_result(server_name: str, transport: str, desc: str, ts: str) -> dict:
+    """Build the result for an auth server that is missing from the registry."""
+    return ServerTestResult(
+        server=server_name,
+        status="not_configured",
+        transport=transport,
+        auth_required=True,
+        test_description=desc,
+        error=f"Server '{server_name}' not found in registry",
+        timestamp=ts
+    ).to_dict()
 
 
 @app.tool()
@@ -271,139 +642,233 @@ async def test_server_with_auth(
     Returns test result with status and details.
     """
     logger = app_ctx.app.logger
+    ts = _now_iso()
 
-    # Create descriptive test messages
-    test_descriptions = {
-        "github": "Search Python AI repos with 1000+ stars",
-        "linear": "Search for bug issues",
-        "notion": "Search workspace for 'meeting notes'",
-        "perplexity": "Ask about latest LLM developments",
-        "supabase": "List your Supabase projects",
-        "hubspot": "Search contacts in CRM",
-        "circleci": "Get pipelines for React repo",
-        "figma": "Get design file data",
-        "atlassian": "Search JIRA for in-progress issues",
-        "airweave": "Search knowledge base for AI trends",
-        "maps-grounding-lite": "Find coffee shops in San Francisco"
-    }
-
-    desc = test_description or test_descriptions.get(server_name, f"Call {test_tool}")
+    desc = _describe_test(server_name, test_tool, test_description)
     logger.info(f"Testing {server_name} server - {desc}...")
 
     try:
         # First, try to check if server is even registered
-        if server_name not in app_ctx.server_registry.server_configs:
-            return {
-                "server": server_name,
-                "status": "not_configured",
-                "transport": transport,
-                "auth_required": True,
-                "test_description": desc,
-                "error": f"Server '{server_name}' not found in registry",
-                "timestamp": datetime.now().isoformat()
-            }
+        if server_name not in _server_configs(app_ctx.server_registry):
+            invalidate_tools_cache(server_name)
+            return _not_configured_result(server_name, transport, desc, ts)
 
         # Attempt to call the test tool
-        result = await app_ctx.server_registry.call_tool(
-            server_name=server_name,
-            tool_name=test_tool,
-            arguments=test_args
+        result = await asyncio.wait_for(
+            call_tool(
+                app_ctx.server_registry,
+                server_name=server_name,
+                tool_name=test_tool,
+                arguments=test_args
+            ),
+            timeout=_TEST_TIMEOUT_S
         )
 
         # Validate we got actual data back
-        content = result.content[0].text if result.content else ""
+        content = _first_text(result)
 
         # Check if response is meaningful
         if not content or len(content) < 2:
             logger.warning(f"{server_name}: Got empty or minimal response")
 
-        return {
-            "server": server_name,
-            "status": "success",
-            "transport": transport,
-            "auth_required": True,
-            "details": f"✓ {desc}",
-            "test_description": desc,
-            "response_length": len(content),
-            "data_sample": content[:150] + "..." if len(content) > 150 else content,
-            "timestamp": datetime.now().isoformat()
-        }
+        return ServerTestResult(
+            server=server_name,
+            status="success",
+            transport=transport,
+            auth_required=True,
+            details=f"✓ {desc}",
+            test_description=desc,
+            data_sample=_sample(content),
+            timestamp=ts,
+            metrics={
+                "response_length": len(content),
+            }
+        ).to_dict()
+
+    except asyncio.TimeoutError as e:
+        logger.error(f"{server_name} server test timed out after {_TEST_TIMEOUT_S:g}s")
+        invalidate_tools_cache(server_name)
+        return ServerTestResult(
+            server=server_name,
+            status="connection_error",
+            transport=transport,
+            auth_required=True,
+            error=f"Timed out after {_TEST_TIMEOUT_S:g}s",
+            error_type=type(e).__name__,
+            timestamp=ts
+        ).to_dict()
 
     except Exception as e:
         logger.error(f"{server_name} server test failed: {type(e).__name__}: {e}")
         error_msg = str(e)
+        error_detail = error_msg
+
+        # Only now consult the tool list, to point out a renamed or missing tool.
+        # Skip it unless the server is pooled, so a failing test doesn't open
+        # a connection nothing will close
+        if server_name in _LAST_USED:
+            try:
+                tools = await asyncio.wait_for(
+                    cached_list_tools(app_ctx.server_registry, server_name),
+                    timeout=_TEST_TIMEOUT_S
+                )
+                if test_tool not in {tool.name for tool in tools}:
+                    error_detail = f"{error_msg} (tool '{test_tool}' is not offered by {server_name})"
+            except Exception:
+                invalidate_tools_cache(server_name)
+
+        # Categorize the error in one scan, highest-priority category wins
+        matched = {m.lastgroup for m in _ERROR_RE.finditer(error_msg)}
+        status = next((category for category in _ERROR_CATEGORIES if category in matched), "error")
+        friendly_error = _ERROR_CATEGORIES.get(status, error_msg)
+
+        return ServerTestResult(
+            server=server_name,
+            status=status,
+            transport=transport,
+            auth_required=True,
+            error=friendly_error,
+            error_detail=error_detail,
+            error_type=type(e).__name__,
+            timestamp=ts
+        ).to_dict()
 
-        # Categorize the error
-        if any(x in error_msg.lower() for x in ["not found", "not configured", "no such server"]):
-            status = "not_configured"
-            friendly_error = "Server or credentials not configured"
-        elif any(x in error_msg.lower() for x in ["unauthorized", "authentication", "forbidden", "401", "403"]):
-            status = "auth_error"
-            friendly_error = "Authentication failed - check credentials/OAuth flow"
-        elif any(x in error_msg.lower() for x in ["timeout", "connection", "refused"]):
-            status = "connection_error"
-            friendly_error = "Connection failed - server may be unreachable"
-        elif any(x in error_msg.lower() for x in ["oauth", "token"]):
-            status = "oauth_required"
-            friendly_error = "OAuth authentication required - run oauth flow first"
-        else:
-            status = "error"
-            friendly_error = error_msg
 
-        return {
-            "server": server_name,
-            "status": status,
-            "transport": transport,
-            "auth_required": True,
-            "error": friendly_error,
-            "error_detail": error_msg,
-            "error_type": type(e).__name__,
-            "timestamp": datetime.now().isoformat()
-        }
+# ===== MAIN TEST ORCHESTRATOR =====
 
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Read an integer setting from the environment, clamped to at least minimum."""
+    raw = os.environ.get(name, str(default))
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from None
+    return max(minimum, value)
 
-# ===== MAIN TEST ORCHESTRATOR =====
 
-@app.async_tool()
-async def run_all_server_tests(app_ctx: Optional[AppContext] = None) -> str:
+# Upper bound on tests in flight at once, so stdio servers don't compete for CPU
+_MAX_CONCURRENCY = _env_int("MCP_TEST_MAX_CONCURRENCY", 6)
+
+# Per-transport limits, so slow servers of one transport can't take every slot
+_TRANSPORT_LIMITS = {"stdio": 4, "sse": 4, "streamable_http": 6}
+
+
+def _concurrency_limits(max_concurrent: int) -> tuple[asyncio.Semaphore, dict[str, asyncio.Semaphore]]:
+    """Create the global and per-transport semaphores for one batch of work."""
+    # A limit below 1 would block every task forever
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    transport_semaphores = {
+        transport: asyncio.Semaphore(limit) for transport, limit in _TRANSPORT_LIMITS.items()
+    }
+    return semaphore, transport_semaphores
+
+
+async def _batch_execute(
+    app_ctx: AppContext,
+    calls: list[dict],
+    max_concurrent: int = _MAX_CONCURRENCY,
+    stop_on_error: bool = False,
+    timeout_ms: int = 30000
+) -> list[dict]:
     """
-    Run comprehensive tests on all configured MCP servers.
+    Run a batch of server tests concurrently and return their results in order.
 
-    This is a long-running workflow that tests all 15 MCP servers and generates
-    a detailed report showing which servers are working, which need configuration,
-    and which have errors.
+    Each call is a dict with the test function under "tool", its keyword
+    arguments under "args", and "server"/"transport"/"auth_required" used to
+    describe the result if the test raises.
 
-    Returns: JSON string with test results for all servers.
+    Args:
+        app_ctx: Application context passed to every test
+        calls: Tests to run
+        max_concurrent: Maximum number of tests in flight at once, on top of
+            the per-transport limits in _TRANSPORT_LIMITS
+        stop_on_error: Cancel the remaining tests as soon as one raises
+        timeout_ms: Per-test deadline in milliseconds
     """
     logger = app_ctx.app.logger
-    logger.info("Starting comprehensive MCP server testing...")
+    semaphore, transport_semaphores = _concurrency_limits(max_concurrent)
 
-    results = []
+    async def run(call: dict) -> dict:
+        transport_semaphore = transport_semaphores.get(call.get("transport")) or nullcontext()
+        async with transport_semaphore, semaphore:
+            return await asyncio.wait_for(
+                call["tool"](**call.get("args", {}), app_ctx=app_ctx),
+                timeout=timeout_ms / 1000
+            )
 
-    # Test no-auth servers
-    logger.info("Testing servers without authentication requirements...")
+    tasks = [asyncio.ensure_future(run(call)) for call in calls]
 
-    no_auth_tests = [
-        test_fetch_server(app_ctx=app_ctx),
-        test_filesystem_server(app_ctx=app_ctx),
-        test_playwright_server(app_ctx=app_ctx),
-        test_sequential_thinking_server(app_ctx=app_ctx),
-    ]
+    if stop_on_error:
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+
+    gathered = await asyncio.gather(*tasks, return_exceptions=True)
 
-    for test_result in await asyncio.gather(*no_auth_tests, return_exceptions=True):
-        if isinstance(test_result, Exception):
-            logger.error(f"Test failed with exception: {test_result}")
-            results.append({
-                "status": "error",
-                "error": str(test_result),
-                "timestamp": datetime.now().isoformat()
-            })
+    ts = _now_iso()
+    results = []
+    for call, outcome in zip(calls, gathered):
+        if not isinstance(outcome, BaseException):
+            results.append(outcome)
+            continue
+
+        status = "error"
+        if isinstance(outcome, asyncio.TimeoutError):
+            status = "connection_error"
+            error = f"Timed out after {timeout_ms} ms"
+        elif isinstance(outcome, asyncio.CancelledError):
+            error = "Cancelled after an earlier test failed"
         else:
-            results.append(test_result)
+            error = str(outcome)
+
+        server_name = call.get("server", "unknown")
+        logger.error(f"{server_name} test failed with exception: {error}")
+        results.append(ServerTestResult(
+            server=server_name,
+            status=status,
+            transport=call.get("transport", "unknown"),
+            auth_required=call.get("auth_required", False),
+            error=error,
+            error_type=type(outcome).__name__,
+            timestamp=ts
+        ).to_dict())
+
+    return results
+
 
-    # Test API key auth servers with realistic queries
-    logger.info("Testing servers with API key authentication...")
+def _write_results(output_file: Path, payload: bytes) -> None:
+    """Write payload to a temp file next to output_file and swap it in atomically."""
+    output_file.parent.mkdir(exist_ok=True)
+    tmp_file = output_file.with_suffix(".json.tmp")
+    tmp_file.write_bytes(payload)
+    os.replace(tmp_file, output_file)
 
+
+# Report writes still in flight; main() drains these before the app shuts down
+_PENDING_WRITES: set[asyncio.Task] = set()
+
+
+async def _save_results(output_file: Path, payload: bytes, logger) -> None:
+    """Write the report off the event loop, logging rather than raising on failure."""
+    try:
+        await asyncio.to_thread(_write_results, output_file, payload)
+    except OSError as e:
+        logger.error(f"Failed to save test results to {output_file}: {e}")
+    else:
+        logger.info(f"Test results saved to {output_file}")
+
+
+async def _run_all_server_tests(app_ctx: AppContext) -> tuple[dict, bytes]:
+    """
+    Run every server test, start saving the report to test_results/ and
+    return it both as a dict and as the serialized JSON bytes being written.
+    """
+    logger = app_ctx.app.logger
+    logger.info("Starting comprehensive MCP server testing...")
+
+    # API key auth servers with realistic queries
     api_key_servers = [
         ("airweave-search", "search", {"query": "AI and machine learning trends"}, "stdio"),
         ("circleci", "get_pipelines", {"org_slug": "gh/facebook", "project_slug": "react"}, "stdio"),
@@ -413,19 +878,7 @@ async def run_all_server_tests(app_ctx: Optional[AppContext] = None) -> str:
         ("supabase", "list_projects", {}, "streamable_http"),
     ]
 
-    for server_name, tool_name, args, transport in api_key_servers:
-        result = await test_server_with_auth(
-            server_name=server_name,
-            test_tool=tool_name,
-            test_args=args,
-            transport=transport,
-            app_ctx=app_ctx
-        )
-        results.append(result)
-
-    # Test OAuth/SSE servers with realistic queries
-    logger.info("Testing servers with OAuth/SSE authentication...")
-
+    # OAuth/SSE servers with realistic queries
     oauth_servers = [
         ("atlassian", "search_issues", {"jql": "project = DEMO AND status = 'In Progress'"}, "sse"),
         ("figma", "get_file", {"file_key": "sample-design-file"}, "streamable_http"),
@@ -434,163 +887,265 @@ async def run_all_server_tests(app_ctx: Optional[AppContext] = None) -> str:
         ("notion", "search", {"query": "meeting notes"}, "streamable_http"),
     ]
 
-    for server_name, tool_name, args, transport in oauth_servers:
-        result = await test_server_with_auth(
-            server_name=server_name,
-            test_tool=tool_name,
-            test_args=args,
-            transport=transport,
-            app_ctx=app_ctx
+    # Build one batch covering no-auth, API key and OAuth servers
+    calls = [
+        {"server": server_name, "transport": transport, "auth_required": False, "tool": tool}
+        for server_name, transport, tool in NO_AUTH_TESTS
+    ]
+
+    # Servers missing from the registry are reported without spawning a test
+    configured = frozenset(_server_configs(app_ctx.server_registry))
+    skipped = []
+    for server_name, tool_name, args, transport in api_key_servers + oauth_servers:
+        if server_name not in configured:
+            skipped.append((server_name, tool_name, transport))
+            continue
+        calls.append({
+            "server": server_name,
+            "transport": transport,
+            "auth_required": True,
+            "tool": test_server_with_auth,
+            "args": {
+                "server_name": server_name,
+                "test_tool": tool_name,
+                "test_args": args,
+                "transport": transport,
+            },
+        })
+
+    logger.info(f"Dispatching {len(calls)} server tests ({len(skipped)} not configured)...")
+
+    # Stamp every result from this run with the run's start time
+    token = _RUN_TIMESTAMP.set(datetime.now().isoformat())
+    try:
+        results = await _batch_execute(app_ctx, calls)
+        results.extend(
+            _not_configured_result(server_name, transport, _describe_test(server_name, tool_name), _now_iso())
+            for server_name, tool_name, transport in skipped
         )
-        results.append(result)
+    finally:
+        _RUN_TIMESTAMP.reset(token)
 
     # Generate summary with detailed status breakdown
+    finished_at = datetime.now()
+    status_counts = Counter(r.get("status") for r in results)
     summary = {
         "test_run": {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": finished_at.isoformat(),
             "total_servers": len(results),
-            "successful": len([r for r in results if r.get("status") == "success"]),
-            "not_configured": len([r for r in results if r.get("status") == "not_configured"]),
-            "auth_errors": len([r for r in results if r.get("status") == "auth_error"]),
-            "oauth_required": len([r for r in results if r.get("status") == "oauth_required"]),
-            "connection_errors": len([r for r in results if r.get("status") == "connection_error"]),
-            "other_errors": len([r for r in results if r.get("status") == "error"]),
-            "total_errors": len([r for r in results if r.get("status") not in ["success", "not_configured"]]),
+            "successful": status_counts["success"],
+            "not_configured": status_counts["not_configured"],
+            "auth_errors": status_counts["auth_error"],
+            "oauth_required": status_counts["oauth_required"],
+            "connection_errors": status_counts["connection_error"],
+            "other_errors": status_counts["error"],
+            "total_errors": len(results) - status_counts["success"] - status_counts["not_configured"],
         },
         "results": results
     }
 
-    # Save results to file
-    output_dir = Path("test_results")
-    output_dir.mkdir(exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = output_dir / f"mcp_server_test_results_{timestamp}.json"
+    # Save results in the background; the caller already gets the same payload
+    timestamp = finished_at.strftime("%Y%m%d_%H%M%S")
+    output_file = Path("test_results") / f"mcp_server_test_results_{timestamp}.json"
 
-    with open(output_file, "w") as f:
-        json.dump(summary, f, indent=2)
+    payload = _dump_json(summary)
+    write_task = asyncio.create_task(_save_results(output_file, payload, logger))
+    _PENDING_WRITES.add(write_task)
+    write_task.add_done_callback(_PENDING_WRITES.discard)
 
-    logger.info(f"Test results saved to {output_file}")
     logger.info(f"Summary: {summary['test_run']['successful']}/{summary['test_run']['total_servers']} servers working")
 
-    return json.dumps(summary, indent=2)
+    return summary, payload
 
 
-@app.tool()
-async def get_server_status_summary(app_ctx: Optional[AppContext] = None) -> str:
+@app.async_tool()
+async def run_all_server_tests(app_ctx: Optional[AppContext] = None) -> str:
     """
-    Get a quick summary of all configured MCP servers and their expected status.
+    Run comprehensive tests on all configured MCP servers.
 
-    Returns: Human-readable summary of server configuration.
-    """
-    servers = {
-        "No Authentication Required": [
-            "fetch - Web requests and HTTP calls",
-            "filesystem - Local file operations",
-            "playwright - Browser automation",
-            "sequential-thinking - Structured reasoning",
-        ],
-        "API Key Authentication": [
-            "airweave-search - Airweave knowledge base search",
-            "circleci - CI/CD pipeline information",
-            "perplexity - Web search and reasoning",
-            "maps-grounding-lite - Google Maps tools",
-            "hubspot - CRM data access",
-            "supabase - Database operations",
-        ],
-        "OAuth/Remote Authentication": [
-            "atlassian - Jira and Confluence",
-            "figma - Design file access",
-            "github - GitHub repositories and actions",
-            "linear - Issue tracking",
-            "notion - Workspace content",
-        ],
-    }
+    This is a long-running workflow that tests all 15 MCP servers and generates
+    a detailed report showing which servers are working, which need configuration,
+    and which have errors.
 
+    Returns: JSON string with test results for all servers.
+    """
+    # Hold one session per server for the whole run and close them all afterwards
+    async with _connection_pool(app_ctx):
+        _, payload = await _run_all_server_tests(app_ctx)
+    return payload.decode()
+
+
+SERVER_CATEGORIES: Final = MappingProxyType({
+    "No Authentication Required": (
+        "fetch - Web requests and HTTP calls",
+        "filesystem - Local file operations",
+        "playwright - Browser automation",
+        "sequential-thinking - Structured reasoning",
+    ),
+    "API Key Authentication": (
+        "airweave-search - Airweave knowledge base search",
+        "circleci - CI/CD pipeline information",
+        "perplexity - Web search and reasoning",
+        "maps-grounding-lite - Google Maps tools",
+        "hubspot - CRM data access",
+        "supabase - Database operations",
+    ),
+    "OAuth/Remote Authentication": (
+        "atlassian - Jira and Confluence",
+        "figma - Design file access",
+        "github - GitHub repositories and actions",
+        "linear - Issue tracking",
+        "notion - Workspace content",
+    ),
+})
+
+
+def _build_status_summary() -> str:
+    """Render the human-readable server configuration summary."""
     summary = ["MCP Server Configuration Summary", "=" * 50, ""]
 
-    for category, server_list in servers.items():
+    for category, server_list in SERVER_CATEGORIES.items():
         summary.append(f"\n{category}:")
         summary.append("-" * 50)
         for server in server_list:
             summary.append(f"  • {server}")
 
     summary.append("\n" + "=" * 50)
-    summary.append(f"Total: {sum(len(s) for s in servers.values())} servers configured")
+    summary.append(f"Total: {sum(len(s) for s in SERVER_CATEGORIES.values())} servers configured")
     summary.append("\nRun 'run_all_server_tests' to test all servers")
 
     return "\n".join(summary)
 
 
+# The server list is static, so the summary is rendered once at import time
+_STATUS_SUMMARY = _build_status_summary()
+
+
+@app.tool()
+async def get_server_status_summary(app_ctx: Optional[AppContext] = None) -> str:
+    """
+    Get a quick summary of all configured MCP servers and their expected status.
+
+    Returns: Human-readable summary of server configuration.
+    """
+    return _STATUS_SUMMARY
+
+
+@app.tool()
+async def get_cache_stats(app_ctx: Optional[AppContext] = None) -> dict:
+    """
+    Get statistics for the in-process tool result and tool list caches.
+
+    Returns: Hit/miss counters and the number of cached entries.
+    """
+    return {
+        "hits": _CACHE_STATS["hits"],
+        "misses": _CACHE_STATS["misses"],
+        "cached_results": len(_TOOL_CACHE),
+        "cached_tool_lists": len(_TOOLS_CACHE),
+    }
+
+
+_STATUS_SYMBOLS: Final = MappingProxyType({
+    'success': '✓',
+    'not_configured': '○',
+    'auth_error': '🔐',
+    'oauth_required': '🔑',
+    'connection_error': '🔌',
+    'error': '✗'
+})
+
+
+def _write_lines(lines: list[str]) -> None:
+    """Write lines to stdout with a single write and flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 async def main():
     """Main entry point for local testing."""
-    async with app.run() as agent_app:
-        print("\n" + "="*70)
-        print("MCP SERVER TESTING FRAMEWORK")
-        print("="*70 + "\n")
+    async with app.run() as agent_app, _connection_pool(agent_app.context):
+        # Collect output lines and write each block to stdout in one go
+        out = []
+        out.append("\n" + "="*70)
+        out.append("MCP SERVER TESTING FRAMEWORK")
+        out.append("="*70 + "\n")
 
         # Get server summary
         summary = await get_server_status_summary(app_ctx=agent_app.context)
-        print(summary)
+        out.append(summary)
 
-        print("\n" + "="*70)
-        print("RUNNING COMPREHENSIVE SERVER TESTS")
-        print("="*70 + "\n")
+        out.append("\n" + "="*70)
+        out.append("RUNNING COMPREHENSIVE SERVER TESTS")
+        out.append("="*70 + "\n")
+        _write_lines(out)
 
         # Run all tests
-        results_json = await run_all_server_tests(app_ctx=agent_app.context)
-        results = json.loads(results_json)
+        results, _ = await _run_all_server_tests(agent_app.context)
 
         # Print summary
-        print("\n" + "="*70)
-        print("TEST RESULTS SUMMARY")
-        print("="*70)
-        print(f"Total Servers: {results['test_run']['total_servers']}")
-        print(f"✓ Successful: {results['test_run']['successful']}")
-        print(f"○ Not Configured: {results['test_run']['not_configured']}")
+        out = []
+        out.append("\n" + "="*70)
+        out.append("TEST RESULTS SUMMARY")
+        out.append("="*70)
+        out.append(f"Total Servers: {results['test_run']['total_servers']}")
+        out.append(f"✓ Successful: {results['test_run']['successful']}")
+        out.append(f"○ Not Configured: {results['test_run']['not_configured']}")
         if results['test_run'].get('auth_errors', 0) > 0:
-            print(f"🔐 Auth Errors: {results['test_run']['auth_errors']}")
+            out.append(f"🔐 Auth Errors: {results['test_run']['auth_errors']}")
         if results['test_run'].get('oauth_required', 0) > 0:
-            print(f"🔑 OAuth Required: {results['test_run']['oauth_required']}")
+            out.append(f"🔑 OAuth Required: {results['test_run']['oauth_required']}")
         if results['test_run'].get('connection_errors', 0) > 0:
-            print(f"🔌 Connection Errors: {results['test_run']['connection_errors']}")
+            out.append(f"🔌 Connection Errors: {results['test_run']['connection_errors']}")
         if results['test_run'].get('other_errors', 0) > 0:
-            print(f"✗ Other Errors: {results['test_run']['other_errors']}")
-        print("="*70 + "\n")
+            out.append(f"✗ Other Errors: {results['test_run']['other_errors']}")
+        out.append("="*70 + "\n")
 
         # Print individual results
-        print("Individual Server Results:")
-        print("-" * 70)
+        out.append("Individual Server Results:")
+        out.append("-" * 70)
+
+        # Group results in one pass so each status is listed together
+        by_status = defaultdict(list)
         for result in results['results']:
-            status_symbol = {
-                'success': '✓',
-                'not_configured': '○',
-                'auth_error': '🔐',
-                'oauth_required': '🔑',
-                'connection_error': '🔌',
-                'error': '✗'
-            }.get(result.get('status', 'error'), '?')
+            by_status[result.get('status', 'error')].append(result)
+        grouped = [
+            result
+            for status in dict.fromkeys((*_STATUS_SYMBOLS, *by_status))
+            for result in by_status.get(status, ())
+        ]
+
+        for result in grouped:
+            status = result.get('status', 'error')
+            status_symbol = _STATUS_SYMBOLS.get(status, '?')
 
             server_name = result.get('server', 'unknown')
-            status = result.get('status', 'error')
             transport = result.get('transport', 'unknown')
 
-            print(f"{status_symbol} {server_name:<25} [{transport:<15}] {status.upper()}")
+            out.append(f"{status_symbol} {server_name:<25} [{transport:<15}] {status.upper()}")
 
             # Show sample data for successful tests
             if status == 'success' and 'data_sample' in result:
                 sample = result['data_sample']
                 if sample and len(sample) > 0:
-                    print(f"  ↳ Data: {sample[:80]}...")
+                    out.append(f"  ↳ Data: {sample[:80]}...")
 
             # Show errors for failed tests
             if 'error' in result:
-                print(f"  ✗ {result['error']}")
+                out.append(f"  ✗ {result['error']}")
                 if 'error_detail' in result and result['error_detail'] != result['error']:
-                    print(f"    Details: {result['error_detail'][:100]}")
+                    out.append(f"    Details: {result['error_detail'][:100]}")
+
+        out.append("\n" + "="*70)
+        _write_lines(out)
 
-        print("\n" + "="*70)
+        # Let the report file finish writing before the app shuts down
+        await asyncio.gather(*_PENDING_WRITES)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop.run arrived in uvloop 0.18; older releases stay on the default loop
+    if uvloop is not None and hasattr(uvloop, "run"):
+        uvloop.run(main())
+    else:
+        asyncio.run(main())